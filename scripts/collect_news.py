@@ -12,51 +12,92 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any
-from difflib import SequenceMatcher
 
+import orjson
 import requests
+import requests_cache
+from simhash import Simhash, SimhashIndex
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from scripts.config import (
     NEWSAPI_KEY,
     NEWSAPI_BASE_URL,
+    PROJECT_ROOT,
     SEARCH_KEYWORD_GROUPS,
     ARTICLES_PER_QUERY,
     MAX_ARTICLES,
     SEARCH_DAYS_BACK,
-    EXCLUDED_DOMAINS,
+    EXCLUDED_DOMAINS_PARAM,
 )
 
 logger = logging.getLogger(__name__)
 
 
+# ──────────────────────────────────────────────
+# 日時パース
+# ──────────────────────────────────────────────
+# ciso8601（C 実装、"Z" サフィックスをネイティブに受け付ける）があれば使い、
+# 無ければ stdlib の fromisoformat にフォールバックする。
+try:
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:
+
+    def parse_iso_datetime(value: str) -> datetime:
+        """ISO 8601 文字列をパースする（fromisoformat フォールバック）。"""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 # ──────────────────────────────────────────────
 # データ型
 # ──────────────────────────────────────────────
+@dataclass(slots=True, repr=False)
 class Article:
-    """取得した記事を表現するデータクラス。"""
-
-    def __init__(
-        self,
-        title: str,
-        description: str,
-        url: str,
-        source: str,
-        published_at: str,
-        image_url: str | None = None,
-    ) -> None:
-        self.title = title
-        self.description = description
-        self.url = url
-        self.source = source
-        self.published_at = published_at
-        self.image_url = image_url
-
-        # 翻訳・要約後に設定されるフィールド
-        self.title_ja: str = ""
-        self.summary_ja: str = ""
-        self.category: str = ""
+    """取得した記事を表現するデータクラス。
+
+    slots 化で記事あたりの __dict__ 分のメモリを節約し、
+    重複判定・ソートで繰り返し使う派生値は __post_init__ で
+    1度だけ計算してフィールドに保持する。
+    """
+
+    title: str
+    description: str
+    url: str
+    source: str
+    published_at: str
+    image_url: str | None = None
+
+    # 翻訳・要約後に設定されるフィールド
+    title_ja: str = ""
+    summary_ja: str = ""
+    category: str = ""
+
+    # 取り込み時に導出されるキャッシュフィールド
+    normalized_url: str = field(init=False)
+    title_lower: str = field(init=False)
+    title_wordcount: int = field(init=False)
+    simhash: int = field(init=False)
+    published_dt: datetime = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.normalized_url = self.url.rstrip("/").lower()
+        self.title_lower = self.title.lower()
+        self.title_wordcount = len(self.title.split())
+
+        # タイトルの 64bit SimHash。重複判定はこのシグネチャ同士の
+        # ハミング距離（XOR + popcount）だけで行える
+        self.simhash = Simhash(self.title_lower.split()).value
+
+        # ソートキーで使う公開日時。list.sort はキー関数を記事ごとに呼ぶため、
+        # パースは取り込み時の1回に集約する（不正値は最古扱い）
+        # publishedAt が null の場合は None が渡ってくる（TypeError）
+        try:
+            self.published_dt = parse_iso_datetime(self.published_at)
+        except (ValueError, TypeError, AttributeError):
+            self.published_dt = datetime.min.replace(tzinfo=timezone.utc)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -78,38 +119,51 @@ class Article:
 # ──────────────────────────────────────────────
 # 重複判定
 # ──────────────────────────────────────────────
-def _is_similar_title(title_a: str, title_b: str, threshold: float = 0.75) -> bool:
-    """2つのタイトルが類似しているかどうかを判定する。"""
-    return SequenceMatcher(None, title_a.lower(), title_b.lower()).ratio() >= threshold
+# SimHash のハミング距離がこの値以下なら近似重複とみなす
+_SIMHASH_MAX_DISTANCE = 6
 
 
 def _deduplicate_articles(articles: list[Article]) -> list[Article]:
-    """URL とタイトル類似度に基づいて重複記事を排除する。"""
+    """URL とタイトル類似度に基づいて重複記事を排除する。
+
+    NewsAPI 由来の重複の大半は URL 一致か完全一致タイトルなので、
+    まず 2 つの set で O(1) に弾く。残りは取り込み時に計算済みの
+    64bit SimHash を SimhashIndex に載せ、ハミング距離 ≤ 6 の近傍が
+    あるかだけで判定する。ペアあたりのコストは XOR + popcount で、
+    文字列比較ベースの類似度計算はホットパスから完全に消える。
+    """
     seen_urls: set[str] = set()
+    seen_title_keys: set[str] = set()
     unique_articles: list[Article] = []
+    index = SimhashIndex([], k=_SIMHASH_MAX_DISTANCE)
 
     for article in articles:
-        # URL ベースの重複チェック
-        normalized_url = article.url.rstrip("/").lower()
-        if normalized_url in seen_urls:
+        # URL ベースの重複チェック（第一段フィルタ）
+        if article.normalized_url in seen_urls:
             logger.debug("URL重複で除外: %s", article.title)
             continue
 
-        # タイトル類似度ベースの重複チェック
-        is_duplicate = False
-        for existing in unique_articles:
-            if _is_similar_title(article.title, existing.title):
-                logger.debug(
-                    "タイトル類似で除外: %s ≈ %s",
-                    article.title,
-                    existing.title,
-                )
-                is_duplicate = True
-                break
-
-        if not is_duplicate:
-            seen_urls.add(normalized_url)
-            unique_articles.append(article)
+        # 空白を正規化したタイトルの完全一致チェック（第二段フィルタ）
+        title_key = " ".join(article.title_lower.split())
+        if title_key in seen_title_keys:
+            logger.debug("タイトル完全一致で除外: %s", article.title)
+            continue
+
+        # SimHash 近傍がある場合は近似重複として除外
+        simhash = Simhash(article.simhash)
+        near_dups = index.get_near_dups(simhash)
+        if near_dups:
+            logger.debug(
+                "タイトル類似で除外: %s ≈ %s",
+                article.title,
+                unique_articles[int(near_dups[0])].title,
+            )
+            continue
+
+        seen_urls.add(article.normalized_url)
+        seen_title_keys.add(title_key)
+        index.add(str(len(unique_articles)), simhash)
+        unique_articles.append(article)
 
     return unique_articles
 
@@ -117,20 +171,27 @@ def _deduplicate_articles(articles: list[Article]) -> list[Article]:
 # ──────────────────────────────────────────────
 # 記事品質フィルタ
 # ──────────────────────────────────────────────
+# NewsAPI が削除済み記事に入れるプレースホルダ（小文字比較）
+_REMOVED_MARKER = "[removed]"
+
+
 def _is_valid_article(raw: dict[str, Any]) -> bool:
-    """記事データの品質チェック。"""
-    title = raw.get("title") or ""
-    description = raw.get("description") or ""
-    url = raw.get("url") or ""
+    """記事データの品質チェック。
 
-    # タイトルまたは説明文が空、URLが無い場合は除外
-    if not title.strip() or not url.strip():
+    フィールドごとに strip は1回だけ行い、判定できた時点で早期 return する
+    （記事 × クエリ数ぶん呼ばれるホットパスのため）。
+    """
+    # タイトルが空、または "[Removed]" プレースホルダの記事を除外
+    title = (raw.get("title") or "").strip()
+    if not title or title.lower() == _REMOVED_MARKER:
         return False
 
-    # "[Removed]" などの無効な記事を除外（NewsAPI が返すことがある）
-    if title.strip().lower() == "[removed]":
+    # URL が無い記事は除外
+    if not (raw.get("url") or "").strip():
         return False
-    if description.strip().lower() == "[removed]":
+
+    description = (raw.get("description") or "").strip()
+    if description.lower() == _REMOVED_MARKER:
         return False
 
     return True
@@ -139,15 +200,51 @@ def _is_valid_article(raw: dict[str, Any]) -> bool:
 # ──────────────────────────────────────────────
 # NewsAPI 呼び出し
 # ──────────────────────────────────────────────
+# NewsAPI レスポンスのディスクキャッシュ有効期限。
+# (query, from, to) が同じリクエストは1日の中では決定的なので、
+# 再実行時のネットワーク往復と API クォータ消費を丸ごと省ける。
+_CACHE_EXPIRE = timedelta(hours=6)
+
+
+def _build_session() -> requests.Session:
+    """keep-alive・自動リトライ・ディスクキャッシュ付きの共有セッションを構築する。
+
+    毎回 requests.get() を呼ぶと TCP+TLS ハンドシェイクが発生するため、
+    モジュールレベルのセッションでコネクションを再利用する。
+    429/5xx は指数バックオフ付きで自動リトライし、同一 URL+パラメータの
+    GET はキャッシュヒット時にネットワークを介さず返す。
+    """
+    session = requests_cache.CachedSession(
+        cache_name=str(PROJECT_ROOT / ".newsapi_cache"),
+        expire_after=_CACHE_EXPIRE,
+        allowable_methods=["GET"],
+    )
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
+
+_SESSION = _build_session()
+
+
 def _fetch_articles_for_query(
     query: str,
     from_date: str,
     to_date: str,
     page_size: int = ARTICLES_PER_QUERY,
 ) -> list[Article]:
-    """1つのキーワードグループに対して NewsAPI を呼び出す。"""
-
-    excluded = ",".join(EXCLUDED_DOMAINS)
+    """指定クエリで NewsAPI を呼び出し、品質チェック済みの記事を返す。"""
 
     params: dict[str, Any] = {
         "q": query,
@@ -158,19 +255,21 @@ def _fetch_articles_for_query(
         "pageSize": page_size,
         "apiKey": NEWSAPI_KEY,
     }
-    if excluded:
-        params["excludeDomains"] = excluded
+    if EXCLUDED_DOMAINS_PARAM:
+        params["excludeDomains"] = EXCLUDED_DOMAINS_PARAM
 
     logger.info("NewsAPI 検索: q=%s, from=%s, to=%s", query, from_date, to_date)
 
     try:
-        response = requests.get(NEWSAPI_BASE_URL, params=params, timeout=30)
+        response = _SESSION.get(NEWSAPI_BASE_URL, params=params, timeout=30)
         response.raise_for_status()
     except requests.RequestException as exc:
         logger.error("NewsAPI リクエストエラー: %s", exc)
         return []
 
-    data = response.json()
+    # requests 組み込みの json() は stdlib パーサ + 文字列デコードを挟むため、
+    # 生バイト列を orjson で直接パースする
+    data = orjson.loads(response.content)
 
     if data.get("status") != "ok":
         logger.error(
@@ -220,11 +319,16 @@ def collect_news() -> list[Article]:
     from_date = (now - timedelta(days=SEARCH_DAYS_BACK)).strftime("%Y-%m-%d")
     to_date = now.strftime("%Y-%m-%d")
 
-    all_articles: list[Article] = []
+    # 全キーワードグループを OR で 1 クエリに結合し、1 リクエストで取得する。
+    # NewsAPI /everything は 500 文字までの Boolean クエリを受け付け、
+    # 現在のグループを結合しても余裕で収まる。往復回数とクォータ消費が
+    # グループ数ぶんの 1/N になり、relevancy ソートは全語横断で効く。
+    combined_query = " OR ".join(f"({group})" for group in SEARCH_KEYWORD_GROUPS)
+    page_size = min(100, ARTICLES_PER_QUERY * len(SEARCH_KEYWORD_GROUPS))
 
-    for query in SEARCH_KEYWORD_GROUPS:
-        articles = _fetch_articles_for_query(query, from_date, to_date)
-        all_articles.extend(articles)
+    all_articles = _fetch_articles_for_query(
+        combined_query, from_date, to_date, page_size=page_size
+    )
 
     logger.info("全キーワードグループ合計: %d 件", len(all_articles))
 
@@ -232,16 +336,8 @@ def collect_news() -> list[Article]:
     unique_articles = _deduplicate_articles(all_articles)
     logger.info("重複排除後: %d 件", len(unique_articles))
 
-    # 公開日の新しい順でソート
-    def _parse_date(article: Article) -> datetime:
-        try:
-            return datetime.fromisoformat(
-                article.published_at.replace("Z", "+00:00")
-            )
-        except (ValueError, AttributeError):
-            return datetime.min.replace(tzinfo=timezone.utc)
-
-    unique_articles.sort(key=_parse_date, reverse=True)
+    # 公開日の新しい順でソート（日時は Article 構築時にパース済み）
+    unique_articles.sort(key=lambda a: a.published_dt, reverse=True)
 
     # 上限数に制限
     result = unique_articles[:MAX_ARTICLES]
@@ -56,6 +56,9 @@ EXCLUDED_DOMAINS = [
     "pinterest.com",
 ]
 
+# NewsAPI の excludeDomains パラメータ用（リクエストごとに join し直さない）
+EXCLUDED_DOMAINS_PARAM = ",".join(EXCLUDED_DOMAINS)
+
 # ──────────────────────────────────────────────
 # Claude API 設定
 # ──────────────────────────────────────────────
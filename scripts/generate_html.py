@@ -12,14 +12,17 @@ HTML生成モジュール — 翻訳済み記事をHTMLファイルに出力す
 from __future__ import annotations
 
 import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader
+import orjson
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
-from scripts.collect_news import Article
-from scripts.config import DOCS_DIR, TEMPLATES_DIR
+from scripts.collect_news import Article, parse_iso_datetime
+from scripts.config import DOCS_DIR, PROJECT_ROOT, TEMPLATES_DIR
 from scripts.translate_summarize import CATEGORIES
 
 logger = logging.getLogger(__name__)
@@ -27,6 +30,48 @@ logger = logging.getLogger(__name__)
 # 日本時間 (JST = UTC+9)
 JST = timezone(timedelta(hours=9))
 
+# Jinja2 環境はモジュールレベルで1度だけ構築する。
+# バイトコードキャッシュにより、テンプレートのコンパイル結果が
+# cron 実行をまたいで再利用される。
+_JINJA_CACHE_DIR = PROJECT_ROOT / ".jinja_cache"
+_JINJA_CACHE_DIR.mkdir(exist_ok=True)
+
+_ENV = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=True,
+    bytecode_cache=FileSystemBytecodeCache(str(_JINJA_CACHE_DIR)),
+)
+
+
+# ──────────────────────────────────────────────
+# 非同期ファイル書き出し
+# ──────────────────────────────────────────────
+# ディスク書き出しで後続処理（メール送信など）をブロックしないよう、
+# 書き込みはバックグラウンドスレッドに逃がす。tmp ファイルへ書いてから
+# os.replace で置き換えるため、途中状態のファイルが公開されることはない。
+_IO_POOL = ThreadPoolExecutor(max_workers=2)
+_PENDING_WRITES: list[Future[None]] = []
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """tmp ファイル経由でアトミックに書き出す（ワーカースレッドで実行）。"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def submit_write(path: Path, data: bytes) -> None:
+    """ファイル書き出しをバックグラウンドに投入する。"""
+    _PENDING_WRITES.append(_IO_POOL.submit(_write_atomic, path, data))
+
+
+def wait_for_writes() -> None:
+    """保留中の書き出しが全て完了するまで待機する（エラーはここで再送出）。"""
+    pending = _PENDING_WRITES[:]
+    _PENDING_WRITES.clear()
+    for future in pending:
+        future.result()
+
 
 # ──────────────────────────────────────────────
 # ユーティリティ
@@ -34,8 +79,7 @@ JST = timezone(timedelta(hours=9))
 def _format_date_ja(iso_date: str) -> str:
     """ISO 8601 日付文字列を日本語形式に変換する。"""
     try:
-        dt = datetime.fromisoformat(iso_date.replace("Z", "+00:00"))
-        dt_jst = dt.astimezone(JST)
+        dt_jst = parse_iso_datetime(iso_date).astimezone(JST)
         return dt_jst.strftime("%Y年%m月%d日")
     except (ValueError, AttributeError):
         return iso_date
@@ -86,12 +130,7 @@ def generate_weekly_report(
     DOCS_DIR.mkdir(parents=True, exist_ok=True)
     output_path = DOCS_DIR / output_filename
 
-    # Jinja2 環境セットアップ
-    env = Environment(
-        loader=FileSystemLoader(str(TEMPLATES_DIR)),
-        autoescape=True,
-    )
-    template = env.get_template("weekly_report.html")
+    template = _ENV.get_template("weekly_report.html")
 
     # テンプレート変数の構築
     period_end = now_jst
@@ -111,12 +150,20 @@ def generate_weekly_report(
     # HTML レンダリング
     html_content = template.render(**context)
 
-    # ファイル書き出し
-    output_path.write_text(html_content, encoding="utf-8")
+    # ファイル書き出し（バックグラウンド）
+    submit_write(output_path, html_content.encode("utf-8"))
     logger.info("HTMLレポート生成: %s", output_path)
 
-    # インデックスページも更新
-    _update_index_page(now_jst)
+    # マニフェストへ追記し、インデックスページを更新する
+    manifest = _load_manifest()
+    if all(entry.get("filename") != output_filename for entry in manifest):
+        manifest.append(
+            {"filename": output_filename, "date": now_jst.date().isoformat()}
+        )
+        manifest.sort(key=lambda entry: entry.get("filename", ""), reverse=True)
+    submit_write(_MANIFEST_PATH, orjson.dumps(manifest))
+
+    _update_index_page(now_jst, manifest)
 
     return output_path
 
@@ -124,124 +171,82 @@ def generate_weekly_report(
 # ──────────────────────────────────────────────
 # インデックスページ（バックナンバー一覧）
 # ──────────────────────────────────────────────
-INDEX_TEMPLATE = """\
-<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>塗装業界ウィークリーニュース — アーカイブ</title>
-    <style>
-        *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Hiragino Sans",
-                         "Noto Sans JP", sans-serif;
-            background: #f8f9fa;
-            color: #1a1a2e;
-            line-height: 1.7;
-        }
-        .container {
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 40px 20px;
-        }
-        h1 {
-            font-size: 1.5rem;
-            font-weight: 700;
-            margin-bottom: 8px;
-        }
-        .subtitle {
-            color: #6b7280;
-            font-size: 0.9rem;
-            margin-bottom: 32px;
-        }
-        .issue-list {
-            list-style: none;
-        }
-        .issue-list li {
-            margin-bottom: 8px;
-        }
-        .issue-list a {
-            display: block;
-            padding: 14px 20px;
-            background: #ffffff;
-            border: 1px solid #e5e7eb;
-            border-radius: 8px;
-            text-decoration: none;
-            color: #1a1a2e;
-            font-weight: 500;
-            transition: box-shadow 0.2s, border-color 0.2s;
-        }
-        .issue-list a:hover {
-            box-shadow: 0 4px 6px -1px rgba(0,0,0,0.07);
-            border-color: #d1d5db;
-        }
-        .issue-list .date {
-            color: #6b7280;
-            font-size: 0.85rem;
-            font-weight: 400;
-        }
-        footer {
-            margin-top: 40px;
-            text-align: center;
-            font-size: 0.8rem;
-            color: #6b7280;
+# レポートファイル名の形式: weekly-news-YYYY-MM-DD.html
+_REPORT_PREFIX = "weekly-news-"
+_REPORT_SUFFIX = ".html"
+
+# 生成済みレポートの一覧マニフェスト。毎週のディレクトリ全走査
+# （アーカイブが増えると O(N)）を避け、追記だけで済ませる。
+_MANIFEST_PATH = DOCS_DIR / ".index.json"
+
+
+def _load_manifest() -> list[dict[str, str]]:
+    """レポート一覧マニフェストを読み込む。
+
+    マニフェストが無い（初回実行・旧バージョンからの移行）または
+    壊れている場合は、ディレクトリ走査で一度だけ再構築する。
+    """
+    try:
+        manifest = orjson.loads(_MANIFEST_PATH.read_bytes())
+        if isinstance(manifest, list):
+            return manifest
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        pass
+
+    logger.info("マニフェストを再構築します: %s", _MANIFEST_PATH)
+    with os.scandir(DOCS_DIR) as entries:
+        names = [
+            e.name
+            for e in entries
+            if e.name.startswith(_REPORT_PREFIX) and e.name.endswith(_REPORT_SUFFIX)
+        ]
+    names.sort(reverse=True)
+    return [
+        {
+            "filename": name,
+            "date": name[len(_REPORT_PREFIX) : -len(_REPORT_SUFFIX)],
         }
-    </style>
-</head>
-<body>
-<div class="container">
-    <h1>🎨 塗装業界ウィークリーニュース</h1>
-    <p class="subtitle">過去のレポート一覧</p>
-    <ul class="issue-list">
-        {issue_items}
-    </ul>
-    <footer>
-        <p>© {year} 塗装業界ニュース自動まとめツール</p>
-    </footer>
-</div>
-</body>
-</html>
-"""
+        for name in names
+    ]
 
 
-def _update_index_page(now: datetime) -> None:
-    """docs/ 内の全レポートをリストするインデックスページを生成する。"""
-    DOCS_DIR.mkdir(parents=True, exist_ok=True)
+def _display_date(date_str: str) -> str:
+    """レポートファイル名中の日付 (YYYY-MM-DD) を「○年○月○日号」に変換する。"""
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y年%m月%d日号")
+    except ValueError:
+        return date_str
 
-    # 既存のHTMLファイルを取得（weekly-news-*.html）
-    report_files = sorted(
-        DOCS_DIR.glob("weekly-news-*.html"),
-        reverse=True,
-    )
 
-    if not report_files:
-        logger.info("レポートファイルが存在しないため、インデックス生成をスキップ")
-        return
+def _update_index_page(now: datetime, manifest: list[dict[str, str]]) -> None:
+    """マニフェストの内容からインデックスページを生成する。
 
-    items_html_parts: list[str] = []
-    for f in report_files:
-        # ファイル名から日付を抽出: weekly-news-YYYY-MM-DD.html
-        date_str = f.stem.replace("weekly-news-", "")
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-            display_date = dt.strftime("%Y年%m月%d日号")
-        except ValueError:
-            display_date = date_str
-
-        items_html_parts.append(
-            f'        <li><a href="{f.name}">'
-            f'<span class="date">{display_date}</span> — '
-            f"塗装業界ウィークリーニュース</a></li>"
-        )
+    Args:
+        now: 実行日時（フッターの年表示に使用）
+        manifest: レポート一覧（新しい順にソート済み）
+    """
+    if not manifest:
+        logger.info("レポートが存在しないため、インデックス生成をスキップ")
+        return
 
-    issue_items = "\n".join(items_html_parts)
-    index_html = INDEX_TEMPLATE.replace("{issue_items}", issue_items).replace(
-        "{year}", str(now.year)
+    # 中間リストを作らず、ジェネレータをそのままテンプレートに流し込む。
+    # レンダリングは Jinja の1パスで完結する（従来は str.replace ×2 で
+    # テンプレート全体を2度コピーしていた）。
+    index_html = _ENV.get_template("index.html").render(
+        issues=(
+            {
+                "filename": entry["filename"],
+                "display_date": _display_date(entry.get("date", "")),
+            }
+            for entry in manifest
+            # 手編集や書きかけで壊れたエントリは読み飛ばす
+            if entry.get("filename")
+        ),
+        year=now.year,
     )
 
     index_path = DOCS_DIR / "index.html"
-    index_path.write_text(index_html, encoding="utf-8")
+    submit_write(index_path, index_html.encode("utf-8"))
     logger.info("インデックスページ更新: %s", index_path)
 
 
@@ -256,16 +261,17 @@ if __name__ == "__main__":
             url="https://example.com/1",
             source="Coating World",
             published_at="2026-02-20T10:00:00Z",
+            title_ja="新しい塗装ブース技術がエネルギー消費を30%削減",
+            summary_ja=(
+                "大手メーカーが開発した新型スプレーブースは、"
+                "エネルギーコストを大幅に削減しながら仕上がり品質を向上させます。"
+                "この技術は従来のブースと比較して30%のエネルギー削減を実現し、"
+                "同時にVOC排出量も低減します。"
+            ),
+            category="equipment",
         ),
     ]
-    test_articles[0].title_ja = "新しい塗装ブース技術がエネルギー消費を30%削減"
-    test_articles[0].summary_ja = (
-        "大手メーカーが開発した新型スプレーブースは、"
-        "エネルギーコストを大幅に削減しながら仕上がり品質を向上させます。"
-        "この技術は従来のブースと比較して30%のエネルギー削減を実現し、"
-        "同時にVOC排出量も低減します。"
-    )
-    test_articles[0].category = "equipment"
 
     path = generate_weekly_report(test_articles)
+    wait_for_writes()
     print(f"Generated: {path}")
@@ -17,15 +17,15 @@
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import sys
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
+
+import orjson
 
 from scripts.collect_news import Article, collect_news
 from scripts.config import DOCS_DIR, LOG_LEVEL
-from scripts.generate_html import generate_weekly_report
+from scripts.generate_html import generate_weekly_report, submit_write, wait_for_writes
 from scripts.send_email import send_notification
 from scripts.translate_summarize import translate_and_summarize
 
@@ -86,21 +86,9 @@ def _create_dummy_articles() -> list[Article]:
         },
     ]
 
-    articles: list[Article] = []
-    for s in samples:
-        a = Article(
-            title=s["title"],
-            description=s["description"],
-            url=s["url"],
-            source=s["source"],
-            published_at=s["published_at"],
-        )
-        a.title_ja = s["title_ja"]
-        a.summary_ja = s["summary_ja"]
-        a.category = s["category"]
-        articles.append(a)
-
-    return articles
+    # Article は slots 付き dataclass なので、翻訳済みフィールドも
+    # コンストラクタでまとめて渡せる
+    return [Article(**s) for s in samples]
 
 
 # ──────────────────────────────────────────────
@@ -113,10 +101,9 @@ def _save_articles_json(articles: list[Article]) -> None:
     json_path = DOCS_DIR / f"articles-{now_jst.strftime('%Y-%m-%d')}.json"
 
     data = [a.to_dict() for a in articles]
-    json_path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    # orjson は UTF-8 バイト列を直接返すため、文字列化・再エンコードが不要。
+    # 書き出し自体はバックグラウンドに逃がし、後続処理をブロックしない。
+    submit_write(json_path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
     logger.info("記事データ保存: %s", json_path)
 
 
@@ -215,6 +202,9 @@ def run_pipeline(
     # ────────────────────────
     # 完了
     # ────────────────────────
+    # バックグラウンドに投入した書き出しをプロセス終了前に待ち合わせる
+    wait_for_writes()
+
     logger.info("")
     logger.info("=" * 60)
     logger.info("パイプライン完了")
@@ -12,13 +12,16 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 
+from jinja2 import BaseLoader, Environment, select_autoescape
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Content,
     Email,
     Mail,
+    Personalization,
     To,
 )
 
@@ -36,34 +39,25 @@ logger = logging.getLogger(__name__)
 # 日本時間
 JST = timezone(timedelta(hours=9))
 
+# SendGrid クライアントはモジュールシングルトンとして遅延初期化する。
+# 送信のたびに urllib3 プール + TLS セッションを作り直すのを避ける。
+_SG_CLIENT: SendGridAPIClient | None = None
+
+
+def _get_client() -> SendGridAPIClient:
+    """共有の SendGrid クライアントを返す（初回呼び出し時に生成）。"""
+    global _SG_CLIENT
+    if _SG_CLIENT is None:
+        _SG_CLIENT = SendGridAPIClient(SENDGRID_API_KEY)
+    return _SG_CLIENT
+
 
 # ──────────────────────────────────────────────
 # メール本文テンプレート
 # ──────────────────────────────────────────────
-def _build_email_html(
-    articles: list[Article],
-    report_url: str,
-    issue_date: str,
-) -> str:
-    """通知メールのHTML本文を構築する。"""
-
-    # カテゴリ別カウント
-    cat_summary_parts: list[str] = []
-    for key, label in CATEGORIES.items():
-        count = sum(1 for a in articles if a.category == key)
-        if count > 0:
-            cat_summary_parts.append(f"{label}: {count}件")
-    cat_summary = " ｜ ".join(cat_summary_parts) if cat_summary_parts else ""
-
-    # 上位5記事のタイトルプレビュー
-    preview_items = ""
-    for article in articles[:5]:
-        preview_items += (
-            f'<li style="margin-bottom:8px;color:#374151;">'
-            f"{article.title_ja}</li>\n"
-        )
-
-    return f"""\
+# テンプレートは import 時に1度だけバイトコードへコンパイルされ、
+# 送信のたびに f-string 連結を解釈し直すコストが消える。
+_EMAIL_TEMPLATE_SRC = """\
 <!DOCTYPE html>
 <html lang="ja">
 <head><meta charset="UTF-8"></head>
@@ -76,30 +70,34 @@ def _build_email_html(
             🎨 塗装業界ウィークリーニュース
         </h1>
         <p style="color:#6b7280;font-size:0.875rem;margin-top:4px;">
-            {issue_date}号
+            {{ issue_date }}号
         </p>
     </div>
 
     <!-- 統計 -->
     <div style="background:#ffffff;border:1px solid #e5e7eb;border-radius:8px;padding:16px 20px;margin-bottom:16px;">
         <p style="margin:0;color:#374151;font-size:0.9rem;">
-            📰 今週は <strong>{len(articles)}件</strong> の記事を収集しました。
+            📰 今週は <strong>{{ total }}件</strong> の記事を収集しました。
         </p>
-        {f'<p style="margin:8px 0 0;color:#6b7280;font-size:0.8rem;">{cat_summary}</p>' if cat_summary else ''}
+        {% if cat_summary %}<p style="margin:8px 0 0;color:#6b7280;font-size:0.8rem;">{{ cat_summary }}</p>{% endif %}
     </div>
 
     <!-- プレビュー -->
-    {f'''<div style="background:#ffffff;border:1px solid #e5e7eb;border-radius:8px;padding:16px 20px;margin-bottom:20px;">
+    {% if preview %}
+    <div style="background:#ffffff;border:1px solid #e5e7eb;border-radius:8px;padding:16px 20px;margin-bottom:20px;">
         <p style="margin:0 0 10px;color:#6b7280;font-size:0.8rem;font-weight:600;">今週の注目記事</p>
         <ul style="margin:0;padding-left:20px;font-size:0.85rem;">
-            {preview_items}
+            {%- for title in preview %}
+            <li style="margin-bottom:8px;color:#374151;">{{ title }}</li>
+            {%- endfor %}
         </ul>
-        {"<p style='margin:8px 0 0;color:#6b7280;font-size:0.8rem;'>他 " + str(len(articles) - 5) + " 件の記事...</p>" if len(articles) > 5 else ""}
-    </div>''' if articles else ''}
+        {% if extra > 0 %}<p style='margin:8px 0 0;color:#6b7280;font-size:0.8rem;'>他 {{ extra }} 件の記事...</p>{% endif %}
+    </div>
+    {% endif %}
 
     <!-- CTA ボタン -->
     <div style="text-align:center;margin-bottom:24px;">
-        <a href="{report_url}"
+        <a href="{{ report_url }}"
            style="display:inline-block;padding:12px 32px;background:#2563eb;color:#ffffff;
                   text-decoration:none;border-radius:8px;font-weight:600;font-size:0.9rem;">
             レポートを読む →
@@ -110,7 +108,7 @@ def _build_email_html(
     <div style="text-align:center;font-size:0.75rem;color:#9ca3af;">
         <p>このメールは塗装業界ニュース自動まとめツールにより送信されています。</p>
         <p>
-            <a href="{PAGES_BASE_URL}" style="color:#6b7280;">
+            <a href="{{ pages_base_url }}" style="color:#6b7280;">
                 過去のレポート一覧
             </a>
         </p>
@@ -121,6 +119,44 @@ def _build_email_html(
 </html>
 """
 
+_ENV = Environment(
+    loader=BaseLoader(),
+    autoescape=select_autoescape(["html"]),
+)
+# 実行中に変わらない値はテンプレートグローバルとして束縛し、
+# render のたびに渡さない（ヘッダー・フッター等の静的部分は
+# Jinja のコンパイラがリテラル文字列チャンクとして出力する）
+_ENV.globals["pages_base_url"] = PAGES_BASE_URL
+_EMAIL_TEMPLATE = _ENV.from_string(_EMAIL_TEMPLATE_SRC)
+
+
+def _build_email_html(
+    articles: list[Article],
+    report_url: str,
+    issue_date: str,
+) -> str:
+    """通知メールのHTML本文を構築する。"""
+
+    # カテゴリ別カウント（カテゴリ数 × 記事数の走査を1パスに集約し、
+    # 中間リストを作らずジェネレータを直接 join に渡す）
+    counts = Counter(a.category for a in articles)
+    cat_summary = " ｜ ".join(
+        f"{label}: {c}件"
+        for key, label in CATEGORIES.items()
+        if (c := counts.get(key, 0)) > 0
+    )
+
+    return _EMAIL_TEMPLATE.render(
+        issue_date=issue_date,
+        total=len(articles),
+        cat_summary=cat_summary,
+        # 上位5記事のタイトルプレビュー。テンプレートの {% for %} 内で
+        # autoescape が効くため、タイトル中の HTML もエスケープされる
+        preview=[article.title_ja for article in articles[:5]],
+        extra=max(0, len(articles) - 5),
+        report_url=report_url,
+    )
+
 
 # ──────────────────────────────────────────────
 # メイン関数
@@ -132,6 +168,9 @@ def send_notification(
     """
     週間レポートの通知メールを送信する。
 
+    NOTIFY_EMAIL はカンマ区切りで複数指定でき、その場合も
+    personalizations により 1 回の API リクエストで全員に送信する。
+
     Args:
         articles: レポートに含まれる記事リスト（プレビュー表示用）
         report_filename: 生成されたHTMLファイル名
@@ -148,12 +187,14 @@ def send_notification(
         logger.error("FROM_EMAIL が設定されていません。")
         raise ValueError("環境変数 FROM_EMAIL を設定してください。")
 
-    if not NOTIFY_EMAIL:
+    recipients = [addr.strip() for addr in NOTIFY_EMAIL.split(",") if addr.strip()]
+    if not recipients:
         logger.error("NOTIFY_EMAIL が設定されていません。")
         raise ValueError("環境変数 NOTIFY_EMAIL を設定してください。")
 
     now_jst = datetime.now(JST)
-    issue_date = now_jst.strftime("%Y年%m月%d日")
+    # strftime のフォーマット文字列解釈を通さず、属性アクセスだけで組み立てる
+    issue_date = f"{now_jst.year}年{now_jst.month:02d}月{now_jst.day:02d}日"
 
     # レポートURL
     report_url = f"{PAGES_BASE_URL.rstrip('/')}/{report_filename}"
@@ -164,20 +205,23 @@ def send_notification(
 
     message = Mail(
         from_email=Email(FROM_EMAIL, "塗装業界ニュース"),
-        to_emails=To(NOTIFY_EMAIL),
         subject=subject,
         html_content=Content("text/html", html_body),
     )
+    # 宛先ごとに personalization を追加（複数宛先でも API 呼び出しは1回）
+    for recipient in recipients:
+        personalization = Personalization()
+        personalization.add_to(To(recipient))
+        message.add_personalization(personalization)
 
     # 送信
     try:
-        client = SendGridAPIClient(SENDGRID_API_KEY)
-        response = client.send(message)
+        response = _get_client().send(message)
 
         if response.status_code in (200, 201, 202):
             logger.info(
                 "メール送信成功: to=%s, status=%d",
-                NOTIFY_EMAIL,
+                ", ".join(recipients),
                 response.status_code,
             )
             return True
@@ -205,11 +249,11 @@ if __name__ == "__main__":
             url="https://example.com",
             source="Test Source",
             published_at="2026-02-20T10:00:00Z",
+            title_ja="テスト記事",
+            summary_ja="これはテスト記事です。",
+            category="technology",
         ),
     ]
-    test_articles[0].title_ja = "テスト記事"
-    test_articles[0].summary_ja = "これはテスト記事です。"
-    test_articles[0].category = "technology"
 
     success = send_notification(test_articles, "weekly-news-2026-02-22.html")
     print(f"Send result: {success}")
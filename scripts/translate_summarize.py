@@ -7,19 +7,28 @@
 - 記事内容の3-5行日本語要約
 - 記事カテゴリの自動分類
 - レート制限への配慮（リトライ付き）
-- バッチ処理による効率化
+- 全記事を1リクエストにまとめるバッチ処理（N往復 → 1往復）
 """
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import sqlite3
+import threading
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import anthropic
-
-from scripts.config import ANTHROPIC_API_KEY, CLAUDE_MODEL, CLAUDE_MAX_TOKENS
+import msgspec
+import orjson
+
+from scripts.config import (
+    ANTHROPIC_API_KEY,
+    CLAUDE_MODEL,
+    CLAUDE_MAX_TOKENS,
+    PROJECT_ROOT,
+)
 from scripts.collect_news import Article
 
 logger = logging.getLogger(__name__)
@@ -43,7 +52,8 @@ CATEGORIES = {
 # ──────────────────────────────────────────────
 SYSTEM_PROMPT = """\
 あなたは塗装業界の専門翻訳者兼アナリストです。
-英語のニュース記事を日本語に翻訳・要約する際、以下のルールに従ってください：
+英語のニュース記事リスト（JSON配列）を日本語に翻訳・要約する際、
+以下のルールに従ってください：
 
 1. タイトルは自然な日本語に翻訳する（意訳可）
 2. 要約は3〜5行で、記事の核心を的確に伝える
@@ -57,91 +67,264 @@ SYSTEM_PROMPT = """\
    - company: 企業ニュース（買収、新製品、人事等）
    - other: その他
 
-回答は必ず以下のJSON形式で返してください:
-{
-  "title_ja": "日本語タイトル",
-  "summary_ja": "3〜5行の日本語要約",
-  "category": "カテゴリキー"
-}
+結果は submit_translations ツールで、入力の全記事について
+同じ id を付けて提出してください。
 """
 
+# 出力スキーマはツール定義として強制する。モデルはこのスキーマに
+# 適合する JSON しか返せないため、コードフェンス剥がしや
+# 欠損キーの補完といったテキスト解析パスが丸ごと不要になる。
+_TRANSLATE_TOOL = {
+    "name": "submit_translations",
+    "description": "全記事の翻訳・要約結果を構造化データとして提出する",
+    "input_schema": {
+        "type": "object",
+        "required": ["translations"],
+        "properties": {
+            "translations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["id", "title_ja", "summary_ja", "category"],
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "title_ja": {"type": "string"},
+                        "summary_ja": {"type": "string"},
+                        "category": {"enum": list(CATEGORIES)},
+                    },
+                },
+            }
+        },
+    },
+}
 
-def _build_user_prompt(article: Article) -> str:
-    """記事データからユーザープロンプトを構築する。"""
-    parts = [
-        f"Title: {article.title}",
-        f"Source: {article.source}",
-    ]
-    if article.description:
-        parts.append(f"Description: {article.description}")
-    parts.append(f"URL: {article.url}")
 
-    return "\n".join(parts)
+def _build_user_prompt(articles: list[Article]) -> str:
+    """記事バッチからユーザープロンプト（JSON配列）を構築する。"""
+    payload = [
+        {
+            "id": i,
+            "title": article.title,
+            "source": article.source,
+            "description": article.description,
+            "url": article.url,
+        }
+        for i, article in enumerate(articles)
+    ]
+    # orjson は非 ASCII をエスケープせず UTF-8 のまま出力する
+    return orjson.dumps(payload).decode()
 
 
 # ──────────────────────────────────────────────
 # Claude API 呼び出し（リトライ付き）
 # ──────────────────────────────────────────────
+# 1リクエストの max_tokens 上限（バッチサイズに比例してスケールさせる際のキャップ）
+_MAX_TOKENS_CAP = 8192
+
+# トークン上限に当たった場合の分割バッチサイズ
+_FALLBACK_CHUNK_SIZE = 10
+
+# 分割バッチを並列送信する際の最大同時リクエスト数
+# （anthropic.Anthropic は httpx コネクションプールを共有しスレッドセーフ）
+_MAX_PARALLEL_BATCHES = 8
+
+
+class _BatchTooLargeError(Exception):
+    """バッチがトークン上限に収まらなかったことを示す内部例外。"""
+
+
+# ──────────────────────────────────────────────
+# 翻訳キャッシュ（SQLite）
+# ──────────────────────────────────────────────
+# 同一記事（URL+タイトル+説明文が不変）の再翻訳で有料 API を
+# 叩き直さないための永続キャッシュ。
+_CACHE_PATH = PROJECT_ROOT / ".claude_cache.sqlite"
+_CACHE_CONN: sqlite3.Connection | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _get_cache() -> sqlite3.Connection:
+    """翻訳キャッシュの接続を返す（初回呼び出し時に生成・初期化）。"""
+    global _CACHE_CONN
+    if _CACHE_CONN is None:
+        conn = sqlite3.connect(_CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "  key TEXT PRIMARY KEY,"
+            "  title_ja TEXT NOT NULL,"
+            "  summary_ja TEXT NOT NULL,"
+            "  category TEXT NOT NULL,"
+            "  ts INTEGER NOT NULL"
+            ")"
+        )
+        conn.commit()
+        _CACHE_CONN = conn
+    return _CACHE_CONN
+
+
+def _cache_key(article: Article) -> str:
+    """記事の内容から安定したキャッシュキーを導出する。"""
+    raw = f"{article.url}\0{article.title}\0{article.description}".encode()
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def _cache_get(article: Article) -> dict[str, str] | None:
+    """キャッシュ済みの翻訳結果を返す（ミス時は None）。"""
+    with _CACHE_LOCK:
+        row = _get_cache().execute(
+            "SELECT title_ja, summary_ja, category FROM translations WHERE key = ?",
+            (_cache_key(article),),
+        ).fetchone()
+    if row is None:
+        return None
+    return {"title_ja": row[0], "summary_ja": row[1], "category": row[2]}
+
+
+def _cache_put(article: Article, result: dict[str, str]) -> None:
+    """API から得た翻訳結果をキャッシュへ保存する。"""
+    with _CACHE_LOCK:
+        conn = _get_cache()
+        conn.execute(
+            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+            (
+                _cache_key(article),
+                result["title_ja"],
+                result["summary_ja"],
+                result["category"],
+                int(time.time()),
+            ),
+        )
+        conn.commit()
+
+
+# 有効なカテゴリキー（応答ごとに再構築しない）
+_VALID_CATEGORIES: frozenset[str] = frozenset(CATEGORIES)
+
+
+class _Translation(msgspec.Struct):
+    """Claude から返る翻訳結果1件のスキーマ。
+
+    msgspec が C レベルで型・必須フィールド検証を行うため、
+    Python 側のキー存在チェックは不要になる。
+    """
+
+    id: int
+    title_ja: str
+    summary_ja: str
+    category: str
+
+
+# Anthropic クライアントはモジュールシングルトンとして遅延初期化する。
+# 生成のたびに httpx クライアント（TCP/TLS プール）が作り直されるのを避け、
+# keep-alive コネクションを記事間・実行間で再利用する。
+_CLIENT: anthropic.Anthropic | None = None
+
+
+def _get_client() -> anthropic.Anthropic:
+    """共有の Anthropic クライアントを返す（初回呼び出し時に生成）。"""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = anthropic.Anthropic(
+            api_key=ANTHROPIC_API_KEY,
+            max_retries=0,  # リトライは _call_claude_with_retry 側で制御する
+            timeout=60.0,
+        )
+    return _CLIENT
+
+
+def _fallback_result(article: Article) -> dict[str, str]:
+    """翻訳に失敗した記事へ適用するフォールバック値。"""
+    return {
+        "title_ja": article.title,
+        "summary_ja": article.description or "（翻訳に失敗しました）",
+        "category": "other",
+    }
+
+
+def _apply_fallback(articles: list[Article]) -> None:
+    """記事リスト全体にフォールバック値を書き込む。"""
+    for article in articles:
+        result = _fallback_result(article)
+        article.title_ja = result["title_ja"]
+        article.summary_ja = result["summary_ja"]
+        article.category = result["category"]
+
+
 def _call_claude_with_retry(
     client: anthropic.Anthropic,
-    article: Article,
+    articles: list[Article],
     max_retries: int = 3,
     base_delay: float = 2.0,
-) -> dict[str, str]:
+) -> dict[int, dict[str, str]]:
     """
-    Claude API を呼び出して翻訳・要約結果を取得する。
+    記事バッチを1回の Claude API 呼び出しで翻訳・要約する。
     レート制限時は指数バックオフでリトライする。
+
+    Returns:
+        dict[int, dict[str, str]]: バッチ内 id → 翻訳結果のマッピング
+
+    Raises:
+        _BatchTooLargeError: バッチがトークン上限に収まらない場合
+            （呼び出し側で分割して再試行する）
     """
-    user_prompt = _build_user_prompt(article)
+    user_prompt = _build_user_prompt(articles)
 
     for attempt in range(max_retries):
         try:
             response = client.messages.create(
                 model=CLAUDE_MODEL,
-                max_tokens=CLAUDE_MAX_TOKENS,
+                max_tokens=min(_MAX_TOKENS_CAP, CLAUDE_MAX_TOKENS * len(articles)),
                 system=SYSTEM_PROMPT,
                 messages=[{"role": "user", "content": user_prompt}],
+                tools=[_TRANSLATE_TOOL],
+                tool_choice={"type": "tool", "name": "submit_translations"},
+            )
+
+            # 出力がトークン上限で途切れた場合は JSON が壊れているので、
+            # バッチを分割して仕切り直す
+            if response.stop_reason == "max_tokens" and len(articles) > 1:
+                raise _BatchTooLargeError(
+                    f"出力がトークン上限で途切れました（{len(articles)} 件）"
+                )
+
+            # 強制ツール呼び出しの入力（SDK がパース済みの dict）を
+            # スキーマ検証付きで構造体へ変換する
+            block = next(
+                (b for b in response.content if b.type == "tool_use"), None
+            )
+            if block is None or not isinstance(block.input, dict):
+                raise IndexError("応答に有効な tool_use ブロックがありません")
+            translations = msgspec.convert(
+                block.input.get("translations", []), type=list[_Translation]
             )
 
-            # レスポンスからテキストを抽出
-            text = response.content[0].text.strip()
-
-            # JSON パース（コードブロックで囲まれている場合に対応）
-            if text.startswith("```"):
-                # ```json ... ``` のパターンに対応
-                lines = text.split("\n")
-                json_lines = []
-                in_block = False
-                for line in lines:
-                    if line.startswith("```") and not in_block:
-                        in_block = True
-                        continue
-                    if line.startswith("```") and in_block:
-                        break
-                    if in_block:
-                        json_lines.append(line)
-                text = "\n".join(json_lines)
-
-            result = json.loads(text)
-
-            # 必要なキーが存在するか検証
-            required_keys = {"title_ja", "summary_ja", "category"}
-            if not required_keys.issubset(result.keys()):
-                missing = required_keys - result.keys()
-                logger.warning("不足キー: %s（記事: %s）", missing, article.title[:40])
-                # デフォルト値で補完
-                result.setdefault("title_ja", article.title)
-                result.setdefault("summary_ja", article.description or "（要約なし）")
-                result.setdefault("category", "other")
-
-            # カテゴリの正規化
-            if result["category"] not in CATEGORIES:
-                result["category"] = "other"
-
-            return result
-
-        except anthropic.RateLimitError:
-            delay = base_delay * (2 ** attempt)
+            results: dict[int, dict[str, str]] = {}
+            for item in translations:
+                if not 0 <= item.id < len(articles):
+                    logger.warning("不正な id を含む応答をスキップ: %r", item.id)
+                    continue
+
+                results[item.id] = {
+                    "title_ja": item.title_ja,
+                    "summary_ja": item.summary_ja,
+                    # カテゴリの正規化
+                    "category": (
+                        item.category
+                        if item.category in _VALID_CATEGORIES
+                        else "other"
+                    ),
+                }
+
+            return results
+
+        except anthropic.RateLimitError as exc:
+            # API が提示する retry-after を優先し、無い場合のみ指数バックオフ。
+            # 固定スリープではなく実際の制限状況に合わせて待つ
+            try:
+                delay = float(exc.response.headers.get("retry-after", ""))
+            except (AttributeError, ValueError):
+                delay = base_delay * (2 ** attempt)
             logger.warning(
                 "レート制限に到達。%0.1f秒後にリトライ（%d/%d）",
                 delay,
@@ -150,46 +333,78 @@ def _call_claude_with_retry(
             )
             time.sleep(delay)
 
+        except anthropic.BadRequestError:
+            # プロンプト自体が大きすぎる場合も分割して仕切り直す
+            if len(articles) > 1:
+                raise _BatchTooLargeError(
+                    f"リクエストが大きすぎます（{len(articles)} 件）"
+                )
+            raise
+
         except anthropic.APIError as exc:
-            logger.error("Claude API エラー: %s（記事: %s）", exc, article.title[:40])
+            logger.error(
+                "Claude API エラー: %s（バッチ: %d 件）", exc, len(articles)
+            )
             if attempt < max_retries - 1:
                 time.sleep(base_delay)
             else:
                 raise
 
-        except (json.JSONDecodeError, KeyError, IndexError) as exc:
+        except (msgspec.DecodeError, IndexError) as exc:
             logger.warning(
-                "レスポンス解析エラー: %s（記事: %s, attempt %d/%d）",
+                "レスポンス解析エラー: %s（バッチ: %d 件, attempt %d/%d）",
                 exc,
-                article.title[:40],
+                len(articles),
                 attempt + 1,
                 max_retries,
             )
             if attempt < max_retries - 1:
                 time.sleep(base_delay)
 
-    # 全リトライ失敗時のフォールバック
-    logger.error("翻訳失敗（フォールバック使用）: %s", article.title[:60])
-    return {
-        "title_ja": article.title,
-        "summary_ja": article.description or "（翻訳に失敗しました）",
-        "category": "other",
-    }
+    # 全リトライ失敗時は空マッピングを返し、呼び出し側でフォールバックを適用する
+    logger.error("翻訳失敗（フォールバック使用）: バッチ %d 件", len(articles))
+    return {}
 
 
 # ──────────────────────────────────────────────
 # メイン関数
 # ──────────────────────────────────────────────
-def translate_and_summarize(
-    articles: list[Article],
-    delay_between_calls: float = 1.0,
-) -> list[Article]:
+def _translate_batch(client: anthropic.Anthropic, articles: list[Article]) -> None:
+    """記事バッチを翻訳し、結果を各 Article に書き込む。"""
+    results = _call_claude_with_retry(client, articles)
+
+    for i, article in enumerate(articles):
+        result = results.get(i)
+        if result is None:
+            logger.warning("翻訳結果なし（フォールバック使用）: %s", article.title[:60])
+            result = _fallback_result(article)
+        else:
+            # API から取得できた結果のみキャッシュする（フォールバックは対象外）
+            _cache_put(article, result)
+
+        article.title_ja = result["title_ja"]
+        article.summary_ja = result["summary_ja"]
+        article.category = result["category"]
+
+        # INFO が無効なときはスライス等の引数構築ごとスキップする
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "  → %s [%s]",
+                article.title_ja[:40],
+                CATEGORIES.get(article.category, "その他"),
+            )
+
+
+def translate_and_summarize(articles: list[Article]) -> list[Article]:
     """
     記事リストを Claude API で翻訳・要約する。
 
+    全記事を1リクエストにまとめて送信するため、往復回数は記事数に
+    よらず基本1回で済む。トークン上限に収まらない場合のみ
+    _FALLBACK_CHUNK_SIZE 件ずつに分割して再送する。
+
     Args:
         articles: 翻訳対象の記事リスト
-        delay_between_calls: API 呼び出し間の待機秒数
 
     Returns:
         list[Article]: 翻訳済みの記事リスト（title_ja, summary_ja, category が設定済み）
@@ -198,34 +413,52 @@ def translate_and_summarize(
         logger.error("ANTHROPIC_API_KEY が設定されていません。")
         raise ValueError("環境変数 ANTHROPIC_API_KEY を設定してください。")
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    client = _get_client()
 
     total = len(articles)
-    logger.info("翻訳・要約開始: %d 件", total)
-
-    for i, article in enumerate(articles, 1):
-        logger.info(
-            "[%d/%d] 翻訳中: %s",
-            i,
-            total,
-            article.title[:60],
+    logger.info("翻訳・要約開始: %d 件（一括リクエスト）", total)
+
+    # キャッシュ済みの記事はバッチに含めず、その場で結果を適用する
+    pending: list[Article] = []
+    for article in articles:
+        cached = _cache_get(article)
+        if cached is None:
+            pending.append(article)
+            continue
+        article.title_ja = cached["title_ja"]
+        article.summary_ja = cached["summary_ja"]
+        article.category = cached["category"]
+    if len(pending) < total:
+        logger.info("キャッシュヒット: %d 件", total - len(pending))
+    if not pending:
+        logger.info("翻訳・要約完了: %d 件（全件キャッシュ）", total)
+        return articles
+
+    try:
+        _translate_batch(client, pending)
+    except _BatchTooLargeError as exc:
+        logger.warning(
+            "%s — %d 件ずつに分割して並列再送します", exc, _FALLBACK_CHUNK_SIZE
         )
-
-        result = _call_claude_with_retry(client, article)
-
-        article.title_ja = result["title_ja"]
-        article.summary_ja = result["summary_ja"]
-        article.category = result["category"]
-
-        logger.info(
-            "  → %s [%s]",
-            article.title_ja[:40],
-            CATEGORIES.get(article.category, "その他"),
-        )
-
-        # レート制限対策の待機（最後の記事では不要）
-        if i < total and delay_between_calls > 0:
-            time.sleep(delay_between_calls)
+        chunks = [
+            pending[start : start + _FALLBACK_CHUNK_SIZE]
+            for start in range(0, len(pending), _FALLBACK_CHUNK_SIZE)
+        ]
+        # 分割バッチはレイテンシ支配なので並列に投げる
+        with ThreadPoolExecutor(
+            max_workers=min(_MAX_PARALLEL_BATCHES, len(chunks))
+        ) as executor:
+            futures = {
+                executor.submit(_translate_batch, client, chunk): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except _BatchTooLargeError as chunk_exc:
+                    # 分割後もなお収まらない場合はフォールバック値で埋める
+                    logger.error("分割バッチも失敗: %s", chunk_exc)
+                    _apply_fallback(futures[future])
 
     logger.info("翻訳・要約完了: %d 件", total)
     return articles